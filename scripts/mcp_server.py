@@ -1,4 +1,5 @@
 import argparse
+import logging
 from jsts_debugger import make_mcp_server
 
 def main():
@@ -9,8 +10,16 @@ def main():
         type=str,
         help="디버깅할 Node.js 프로젝트의 경로",
     )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="INFO",
+        help="로그 레벨 (DEBUG, INFO, WARNING, ...)",
+    )
     args = parser.parse_args()
 
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(message)s")
+
     mcp_server = make_mcp_server("jsts-debugger", args.project_path)
 
     print(f"MCP server starting for project at: {args.project_path}")
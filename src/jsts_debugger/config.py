@@ -1,3 +1,4 @@
+import sys
 from typing import Literal, get_args, Any
 from pydantic import BaseModel
 
@@ -45,7 +46,7 @@ AllowedDebuggerCommand = Literal[
 ]
 
 allowed_debugger_commands: list[AllowedDebuggerCommand] = list(get_args(AllowedDebuggerCommand))
-allowed_debugger_commands_set: set[AllowedDebuggerCommand] = set(get_args(AllowedDebuggerCommand))
+allowed_debugger_commands_set: frozenset[str] = frozenset(sys.intern(command) for command in get_args(AllowedDebuggerCommand))
 
 entrypoint_ts_path = "/app/entrypoint.ts"
 
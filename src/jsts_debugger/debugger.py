@@ -10,12 +10,14 @@ import atexit
 import asyncio
 import hashlib
 import os
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Callable, List, Optional, Dict, Any, Tuple
 import shutil
 import json
 import io
+import logging
 import tarfile
-from pathlib import Path
+import tempfile
+from functools import cache, lru_cache
 
 import docker
 import httpx
@@ -40,6 +42,65 @@ from .helpers import get_package_name
 from .lib.utils.deep_merge import deep_merge
 from pydantic import BaseModel
 
+log = logging.getLogger(__name__)
+
+# Backoff between polls of the inspector's /json/list endpoint (about 6.5s in total).
+_CONNECT_RETRY_DELAYS = (0.05, 0.1, 0.2, 0.4, 0.8, 1.0, 1.0, 1.0, 1.0, 1.0)
+
+
+@cache
+def _load_template(name: str) -> str:
+    """Reads a packaged template once per process."""
+    return files("jsts_debugger").joinpath(f"templates/{name}").read_text()
+
+
+@cache
+def _load_json_template(name: str) -> Dict[str, Any]:
+    """
+    Parses a packaged JSON template once per process.
+    The returned dict is shared; deep_merge never mutates its inputs, so it is safe as a merge base.
+    """
+    return json.loads(_load_template(name))
+
+
+@lru_cache(maxsize=256)
+def _image_tag_cached(abs_path: str, code: str) -> str:
+    """Hashes the project path and entry code into an image tag, memoized for repeated snippets."""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(abs_path.encode("utf-8"))
+    hasher.update(b"::")
+    hasher.update(code.encode("utf-8"))
+    return f"jsts_debugger/project:{hasher.hexdigest()}"
+
+
+def _build_context_filter(repo_name: str) -> Callable[[tarfile.TarInfo], Optional[tarfile.TarInfo]]:
+    """
+    Returns a tar filter that excludes the project's top-level node_modules
+    (reinstalled inside the image) and .git directory from the build context.
+    Paths are matched against the full repo_name prefix, which may be scoped ("@scope/pkg").
+    """
+    excluded = tuple(f"{repo_name}/{name}" for name in ("node_modules", ".git"))
+    excluded_prefixes = tuple(f"{path}/" for path in excluded)
+
+    def context_filter(tarinfo: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
+        if tarinfo.name in excluded or tarinfo.name.startswith(excluded_prefixes):
+            return None
+        return tarinfo
+
+    return context_filter
+
+
+def _add_bytes(tar: tarfile.TarFile, name: str, data: bytes, mode: int = 0o644) -> None:
+    """
+    Adds an in-memory file to the build context. mtime is pinned to 0 so identical
+    contents produce identical layers and keep Docker's build cache warm.
+    """
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mode = mode
+    info.mtime = 0
+    tar.addfile(info, io.BytesIO(data))
+
 
 class JSTSDebuggerError(Exception):
     """Base exception for jsts_debugger."""
@@ -90,6 +151,14 @@ class CDPItem(BaseModel):
     type: str
     data: Dict[str, Any]
 
+    @classmethod
+    def from_session_item(cls, item: Dict[str, Any]) -> "CDPItem":
+        """
+        Wrap an item produced by JSTSSession without re-validating its payload.
+        Session items are always {"type": str, "data": dict}, and CDP payloads can be large.
+        """
+        return cls.model_construct(type=item["type"], data=item["data"])
+
 
 class JSTSDebugger:
     """
@@ -100,9 +169,9 @@ class JSTSDebugger:
         self,
     ):
         """Initializes the JSTSDebugger."""
-        self.base_dockerfile_content = files("jsts_debugger").joinpath("templates/Dockerfile.base").read_text()
-        self.base_package_json = json.loads(files("jsts_debugger").joinpath("templates/package.base.json").read_text())
-        self.base_tsconfig_json = json.loads(files("jsts_debugger").joinpath("templates/tsconfig.base.json").read_text())
+        self.base_dockerfile_content = _load_template("Dockerfile.base")
+        self.base_package_json = _load_json_template("package.base.json")
+        self.base_tsconfig_json = _load_json_template("tsconfig.base.json")
         
         try:
             self.docker_client: DockerClient = docker.from_env()
@@ -112,7 +181,7 @@ class JSTSDebugger:
             )
         self.sessions: dict[str, JSTSSession] = {}
         atexit.register(self.close_all_sessions)
-        print("JSTSDebugger initialized. Ready to create sessions.")
+        log.info("JSTSDebugger initialized. Ready to create sessions.")
 
     def _get_image_tag(self, project_path: str, code: str) -> str:
         """Generates a unique Docker image tag based on project path and entry code.
@@ -120,12 +189,7 @@ class JSTSDebugger:
         Including the entrypoint code in the hash ensures different code snippets
         do not accidentally reuse an image built for a previous test/session.
         """
-        abs_path = os.path.abspath(project_path)
-        hasher = hashlib.md5()
-        hasher.update(abs_path.encode("utf-8"))
-        hasher.update(b"::")
-        hasher.update(code.encode("utf-8"))
-        return f"jsts_debugger/project:{hasher.hexdigest()}"
+        return _image_tag_cached(os.path.abspath(project_path), code)
 
     async def _build_or_get_image(
         self,
@@ -137,77 +201,59 @@ class JSTSDebugger:
     ) -> None:
         """Builds a Docker image if it doesn't exist, or gets the existing one."""
         try:
-            self.docker_client.images.get(image_tag)
-            print(f"Found cached image: {image_tag}")
+            await asyncio.to_thread(self.docker_client.images.get, image_tag)
+            log.info("Found cached image: %s", image_tag)
             return
         except ImageNotFound:
-            print(
-                f"Image not found. Building image for {project_path} with tag {image_tag}..."
+            log.info(
+                "Image not found. Building image for %s with tag %s...", project_path, image_tag
             )
 
+        repo_name = get_package_name(project_path)
+        if repo_name is None:
+            raise ValueError(f"Package name not found in {project_path}")
+
         # Merge package.json and tsconfig.json data
         final_package_json = deep_merge(self.base_package_json, package_json_data or {})
         final_tsconfig_json = deep_merge(
             self.base_tsconfig_json, tsconfig_json_data or {}
         )
 
-        buf = io.BytesIO()
-        with tarfile.open(fileobj=buf, mode="w") as tar:
-            repo_name = get_package_name(project_path)
-            if repo_name is None:
-                raise ValueError(f"Package name not found in {project_path}")
-            
-            # Add project files to tar
-            for root, _, files in os.walk(project_path):
-                for file in files:
-                    host_path = Path(root) / file
-                    arc_path = str(host_path.relative_to(project_path))
-                    tar.add(str(host_path), repo_name + "/" + arc_path)
-
-            # Add dynamically generated files
-            # 1. Dockerfile
-            dockerfile_content = self.base_dockerfile_content
-            if repo_name is None:
-                raise ValueError(f"Package name not found in {project_path}")
-            dockerfile_content = dockerfile_content.replace("{repo_name}", repo_name)
-            dockerfile_info = tarfile.TarInfo("Dockerfile")
-            dockerfile_bytes = dockerfile_content.encode("utf-8")
-            dockerfile_info.size = len(dockerfile_bytes)
-            tar.addfile(dockerfile_info, io.BytesIO(dockerfile_bytes))
-
-            # 2. package.json
-            package_json_str = json.dumps(final_package_json, indent=4)
-            package_json_info = tarfile.TarInfo(f"package.json")
-            package_json_bytes = package_json_str.encode("utf-8")
-            package_json_info.size = len(package_json_bytes)
-            tar.addfile(package_json_info, io.BytesIO(package_json_bytes))
-
-            # 3. tsconfig.json
-            tsconfig_json_str = json.dumps(final_tsconfig_json, indent=4)
-            tsconfig_json_info = tarfile.TarInfo(f"tsconfig.json")
-            tsconfig_json_bytes = tsconfig_json_str.encode("utf-8")
-            tsconfig_json_info.size = len(tsconfig_json_bytes)
-            tar.addfile(tsconfig_json_info, io.BytesIO(tsconfig_json_bytes))
-
-            # 4. Entrypoint code
-            entrypoint_info = tarfile.TarInfo("entrypoint.ts")
-            code_bytes = code.encode("utf-8")
-            entrypoint_info.size = len(code_bytes)
-            tar.addfile(entrypoint_info, io.BytesIO(code_bytes))
-
-        buf.seek(0)
+        # Write the gzipped build context to an anonymous temporary file, so large
+        # projects are not held in memory while docker-py uploads the context.
+        with tempfile.TemporaryFile() as buf:
+            with tarfile.open(fileobj=buf, mode="w:gz", compresslevel=1) as tar:
+                # Add project files to tar
+                tar.add(project_path, arcname=repo_name, filter=_build_context_filter(repo_name))
 
-        try:
-            self.docker_client.images.build(
-                fileobj=buf,
-                custom_context=True,
-                tag=image_tag,
-                rm=True,
-                encoding="gzip",
-            )
-            print(f"Image built successfully: {image_tag}")
-        except (BuildError, APIError) as e:
-            raise DockerBuildError(f"Error building Docker image: {e}") from e
+                # Add dynamically generated files
+                # 1. Dockerfile
+                dockerfile_content = self.base_dockerfile_content.replace("{repo_name}", repo_name)
+                _add_bytes(tar, "Dockerfile", dockerfile_content.encode("utf-8"))
+
+                # 2. package.json
+                _add_bytes(tar, "package.json", json.dumps(final_package_json, indent=4).encode("utf-8"))
+
+                # 3. tsconfig.json
+                _add_bytes(tar, "tsconfig.json", json.dumps(final_tsconfig_json, indent=4).encode("utf-8"))
+
+                # 4. Entrypoint code
+                _add_bytes(tar, "entrypoint.ts", code.encode("utf-8"))
+
+            buf.seek(0)
+
+            try:
+                await asyncio.to_thread(
+                    self.docker_client.images.build,
+                    fileobj=buf,
+                    custom_context=True,
+                    tag=image_tag,
+                    rm=True,
+                    encoding="gzip",
+                )
+                log.info("Image built successfully: %s", image_tag)
+            except (BuildError, APIError) as e:
+                raise DockerBuildError(f"Error building Docker image: {e}") from e
 
     def _build_command(self, entry: str, port: int = 9229) -> List[str]:
         """
@@ -228,7 +274,7 @@ class JSTSDebugger:
         
         return cmd
 
-    def _start_container(
+    async def _start_container(
         self,
         image_tag: str,
     ) -> Container:
@@ -237,14 +283,15 @@ class JSTSDebugger:
         command = self._build_command(container_entrypoint_path)
 
         try:
-            container = self.docker_client.containers.run(
+            container = await asyncio.to_thread(
+                self.docker_client.containers.run,
                 image=image_tag,
                 command=command,
                 ports={"9229/tcp": None},
                 detach=True,
                 remove=True,
             )
-            print(f"Container {container.short_id} started.")
+            log.info("Container %s started.", container.short_id)
             return container
         except (ContainerError, APIError) as e:
             raise ContainerStartError(f"Error starting container: {e}") from e
@@ -254,13 +301,13 @@ class JSTSDebugger:
     ) -> ClientConnection:
         """Connects to the debugger inside the container and returns a WebSocket client."""
         try:
-            container.reload()
+            await asyncio.to_thread(container.reload)
             host_port = container.ports["9229/tcp"][0]["HostPort"]
-            await asyncio.sleep(1.5)  # Wait for the debugger to initialize
 
             ws_url_info = f"http://127.0.0.1:{host_port}/json/list"
             async with httpx.AsyncClient() as client:
-                for _ in range(5):  # Retry mechanism
+                # None marks the final poll, which is not followed by a sleep.
+                for delay in (*_CONNECT_RETRY_DELAYS, None):
                     try:
                         resp = await client.get(ws_url_info, timeout=10)
                         resp.raise_for_status()
@@ -275,12 +322,15 @@ class JSTSDebugger:
                                 ping_timeout=None,
                                 close_timeout=5,
                             )
-                    except (httpx.RequestError, KeyError, IndexError):
-                        await asyncio.sleep(1)
-                else:
-                    raise DebuggerConnectionError(
-                        "Could not get WebSocket debugger URL after retries."
-                    )
+                    except (httpx.RequestError, httpx.HTTPStatusError, ValueError, KeyError, IndexError):
+                        pass
+                    if delay is None:
+                        break
+                    # The debugger is not listening yet; back off before polling again.
+                    await asyncio.sleep(delay)
+                raise DebuggerConnectionError(
+                    "Could not get WebSocket debugger URL after retries."
+                )
         except (ConnectionError, WebSocketException, KeyError) as e:
             raise DebuggerConnectionError(f"Failed to connect to debugger: {e}") from e
 
@@ -313,7 +363,7 @@ class JSTSDebugger:
                 package_json_data,
                 tsconfig_json_data,
             )
-            container = self._start_container(image_tag)
+            container = await self._start_container(image_tag)
             ws = await self._connect_to_debugger(container)
 
             session_id = container.short_id
@@ -329,18 +379,18 @@ class JSTSDebugger:
             # time.sleep(1000000) # debug
 
             items_raw: List[Dict[str, Any]] = events + execution_result
-            print('items_raw', items_raw)
-            items: List[CDPItem] = [CDPItem.model_validate(item) for item in items_raw]
-            print('items', items)
+            log.debug("items_raw %s", items_raw)
+            items: List[CDPItem] = [CDPItem.from_session_item(item) for item in items_raw]
+            log.debug("items %s", items)
             return new_session, items
 
         except JSTSDebuggerError:
             if container:
-                container.stop()
+                await asyncio.to_thread(container.stop)
             raise
         except Exception as e:
             if container:
-                container.stop()
+                await asyncio.to_thread(container.stop)
             raise JSTSDebuggerError(
                 f"An unexpected error occurred during session creation: {e}"
             ) from e
@@ -349,26 +399,44 @@ class JSTSDebugger:
     async def close_session(self, session_id: str):
         """Closes a specific debugging session by its ID."""
         if session_id in self.sessions:
-            print(f"Closing session {session_id}...")
+            log.info("Closing session %s...", session_id)
             session = self.sessions.pop(session_id)
             await session.close()
-            print(f"Session {session_id} closed.")
+            log.info("Session %s closed.", session_id)
         else:
-            print(f"Warning: Session {session_id} not found.")
+            log.warning("Session %s not found.", session_id)
 
     def close_all_sessions(self):
         """Closes all active debugging sessions."""
-        print("Closing all active sessions...")
+        log.info("Closing all active sessions...")
         if not self.sessions:
             return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop, e.g. in atexit: worker threads can no longer be started,
+            # so stop the containers directly. Stopping a container also drops its WebSocket.
+            for session_id in list(self.sessions.keys()):
+                session = self.sessions.pop(session_id)
+                try:
+                    session.stop_container()
+                except Exception as e:
+                    log.error("Failed to stop container for session %s: %s", session_id, e)
+            log.info("All sessions closed.")
+            return
+        loop.create_task(self._close_all_sessions_async())
+
+    async def _close_all_sessions_async(self):
+        """Closes all active debugging sessions concurrently."""
         session_ids = list(self.sessions.keys())
-        for session_id in session_ids:
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(self.close_session(session_id))
-            except RuntimeError:
-                asyncio.run(self.close_session(session_id))
-        print("All sessions closed.")
+        results = await asyncio.gather(
+            *(self.close_session(session_id) for session_id in session_ids),
+            return_exceptions=True,
+        )
+        for session_id, result in zip(session_ids, results):
+            if isinstance(result, BaseException):
+                log.error("Failed to close session %s: %s", session_id, result)
+        log.info("All sessions closed.")
 
     def get_session(self, session_id: str) -> Optional[JSTSSession]:
         """
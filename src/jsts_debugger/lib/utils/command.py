@@ -1,68 +1,120 @@
+import sys
+from enum import IntFlag
+
+
+class CommandKind(IntFlag):
+    """
+    Classification of a CDP method name. A method may belong to several kinds.
+    classify_command returns plain ints, since IntFlag operators are slow on hot paths;
+    use int(CommandKind.X) when testing its result.
+    """
+    NONE = 0
+    FINISHED = 1   # the script has finished executing
+    PAUSED = 2     # the debugger has paused
+    RESUMED = 4    # the debugger has resumed
+    IGNORE = 8     # event that is dropped by the session
+    RUN = 16       # command that runs/continues program execution
+    MAY_RUN = 32   # command that may run/continue program execution
+
+
+_SCRIPT_FINISHED_COMMANDS: frozenset[str] = frozenset(map(sys.intern, {
+    "Inspector.detached",
+    "Runtime.executionContextDestroyed",
+}))
+
+_PROGRAM_RUN_COMMANDS: frozenset[str] = frozenset(map(sys.intern, {
+    "Debugger.resume",
+    "Debugger.stepInto",
+    "Debugger.stepOut",
+    "Debugger.stepOver",
+}))
+
+_MAY_RUN_COMMANDS: frozenset[str] = frozenset(map(sys.intern, {
+    "Runtime.runIfWaitingForDebugger",
+    "Debugger.setSkipAllPauses",
+}))
+
+_FINISHED = int(CommandKind.FINISHED)
+_PAUSED = int(CommandKind.PAUSED)
+_RESUMED = int(CommandKind.RESUMED)
+_IGNORE = int(CommandKind.IGNORE)
+_RUN = int(CommandKind.RUN)
+_MAY_RUN = int(CommandKind.MAY_RUN)
+
+_COMMAND_KIND: dict[str, int] = {
+    **dict.fromkeys(_SCRIPT_FINISHED_COMMANDS, _FINISHED),
+    sys.intern("Debugger.paused"): _PAUSED,
+    sys.intern("Debugger.resumed"): _RESUMED,
+    sys.intern("Debugger.scriptParsed"): _IGNORE,
+    **dict.fromkeys(_PROGRAM_RUN_COMMANDS, _RUN),
+    **dict.fromkeys(_MAY_RUN_COMMANDS, _MAY_RUN),
+}
+
+
+def classify_command(command: str) -> int:
+    """
+    Classify the given command with a single lookup.
+
+    Args:
+        command (str): The command to classify
+
+    Returns:
+        int: The CommandKind bits the command belongs to, or 0 if unknown
+    """
+    return _COMMAND_KIND.get(command, 0)
+
+
 def is_script_finished_command(command: str) -> bool:
     """
     Check if the given command indicates that the script has finished executing.
-    
+
     Args:
         command (str): The command to check
-        
+
     Returns:
         bool: True if the command indicates script completion, False otherwise
     """
-    script_finished_commands = {
-        "Inspector.detached",
-        "Runtime.executionContextDestroyed"
-    }
-    return command in script_finished_commands
+    return bool(classify_command(command) & _FINISHED)
 
 def is_debugger_paused_command(command: str) -> bool:
     """
     Check if the given command indicates that the debugger has paused.
     """
-    return command == "Debugger.paused"
+    return bool(classify_command(command) & _PAUSED)
 
 def is_debugger_resumed_command(command: str) -> bool:
     """
     Check if the given command indicates that the debugger has resumed.
     """
-    return command == "Debugger.resumed"
+    return bool(classify_command(command) & _RESUMED)
 
 def is_command_to_ignore(command: str) -> bool:
     """
     Check if the given command should be ignored.
     """
-    return command == "Debugger.scriptParsed"
+    return bool(classify_command(command) & _IGNORE)
 
 
 def is_program_run_command(command: str) -> bool:
     """
     Check if the given command is one that runs/continues program execution.
-    
+
     Args:
         command (str): The command to check
-        
+
     Returns:
         bool: True if the command runs/continues program execution, False otherwise
     """
-    run_commands = {
-        "Debugger.resume",
-        "Debugger.stepInto", 
-        "Debugger.stepOut",
-        "Debugger.stepOver",
-    }
-    return command in run_commands
+    return bool(classify_command(command) & _RUN)
 
 def is_command_may_run(command: str) -> bool:
     """
     Check if the given command may potentially run/continue program execution.
-    
+
     Args:
         command (str): The command to check
-        
+
     Returns:
         bool: True if the command may run program execution, False otherwise
     """
-    may_run_commands = {
-        "Runtime.runIfWaitingForDebugger",
-        "Debugger.setSkipAllPauses",
-    }
-    return command in may_run_commands
+    return bool(classify_command(command) & _MAY_RUN)
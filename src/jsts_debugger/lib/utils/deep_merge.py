@@ -2,6 +2,7 @@ def deep_merge(dict1: dict, dict2: dict) -> dict:
     """
     Recursively merge two dictionaries, with values from dict2 taking precedence.
     Nested dictionaries are merged rather than replaced.
+    Neither input is modified; only dictionaries on a merged path are copied.
     
     Args:
         dict1: First dictionary
@@ -10,12 +11,36 @@ def deep_merge(dict1: dict, dict2: dict) -> dict:
     Returns:
         Merged dictionary
     """
+    if not dict2:
+        return dict1.copy()
+    if not dict1:
+        return dict2.copy()
+    if not _has_nested_overlap(dict1, dict2):
+        return dict1 | dict2
     merged = dict1.copy()
-    
-    for key, value in dict2.items():
-        if key in merged and isinstance(merged[key], dict) and isinstance(value, dict):
-            merged[key] = deep_merge(merged[key], value)
-        else:
-            merged[key] = value
-            
+    _merge_into(merged, dict2)
     return merged
+
+
+def _has_nested_overlap(target: dict, source: dict) -> bool:
+    # True if some key holds a dict on both sides, i.e. a plain update would replace instead of merge.
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            return True
+    return False
+
+
+def _merge_into(target: dict, source: dict) -> None:
+    # Walk nested dictionaries with an explicit stack instead of recursion.
+    # Nested dictionaries of target are copied before being merged into, so the inputs stay untouched.
+    stack = [(target, source)]
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            existing = dst.get(key)
+            if isinstance(existing, dict) and isinstance(value, dict):
+                existing = existing.copy()
+                dst[key] = existing
+                stack.append((existing, value))
+            else:
+                dst[key] = value
@@ -1,4 +1,6 @@
 import re
 
+_WS_RE = re.compile(r"[ \t]+")
+
 def remove_tabs(text: str) -> str:
-    return re.sub(r"[ \t]+", " ", text)
\ No newline at end of file
+    return _WS_RE.sub(" ", text)
\ No newline at end of file
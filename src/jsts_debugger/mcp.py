@@ -4,6 +4,7 @@ import json
 from jsts_debugger.config import AllowedDebuggerCommand, allowed_debugger_commands, DebuggerCommand
 from jsts_debugger.debugger import JSTSDebugger, CDPItem
 from typing import Any, Optional, Dict, List
+import os
 import traceback
 import re
 from jsts_debugger.helpers import get_package_name
@@ -33,17 +34,23 @@ class CloseSessionResult(BaseModel):
     stack_trace: Optional[str] = None
 
 
-def make_mcp_server(name: str, project_path: str) -> FastMCP:
-    mcp = FastMCP(name=name, instructions=remove_tabs("""
+# Stack traces are only formatted into error results when JSTS_DEBUG_TRACEBACKS=1.
+_DEBUG_TRACEBACKS = os.environ.get("JSTS_DEBUG_TRACEBACKS", "0") == "1"
+
+
+def _stack_trace() -> Optional[str]:
+    return traceback.format_exc() if _DEBUG_TRACEBACKS else None
+
+
+_INSTRUCTIONS = remove_tabs("""
                   Debug JavaScript/TypeScript repository via the Chrome DevTools Protocol (CDP).
                   1) Create a session with your entrypoint code. Execution starts immediately.
                   2) Use 'debugger;' in your code (at least once) to pause and inspect.
                   3) Execute CDP commands (set breakpoints, step, evaluate, etc.) against that session.
-                  """))
-    debugger = JSTSDebugger()
+                  """)
 
-    @mcp.tool(
-        description=remove_tabs(f"""
+# Formatted with the project's package name in make_mcp_server.
+_CREATE_SESSION_DESCRIPTION_TEMPLATE = remove_tabs("""
             Create a new debugging session in an isolated Docker container.
             The provided code is written to /app/entrypoint.ts and executed with Node (tsx).
             Returns 'session_id' and 'execution_result' (events up to the first pause or termination).
@@ -57,7 +64,7 @@ def make_mcp_server(name: str, project_path: str) -> FastMCP:
             Options:
             - timeout (seconds, default 30)
 
-            You can set breakpoints under /app/{get_package_name(project_path)}/... to debug project files.
+            You can set breakpoints under /app/{package_name}/... to debug project files.
             Each session runs in its own container.
 
             Container layout:
@@ -65,7 +72,7 @@ def make_mcp_server(name: str, project_path: str) -> FastMCP:
                 /entrypoint.ts
                 /package.json
                 /tsconfig.json
-                /{get_package_name(project_path)}
+                /{package_name}
                     /...
 
             package.json: ```json
@@ -92,33 +99,10 @@ def make_mcp_server(name: str, project_path: str) -> FastMCP:
             "include": ["**/*"]
             }}
             ```
-        """),
-    )
-    async def create_session(
-        code: str,
-        timeout: int = 30,
-    ) -> CreateSessionResult:
-        """
-        새로운 디버깅 세션을 생성하고 초기 이벤트 목록을 반환합니다.
-        """
-        try:
-            session, execution_result = await debugger.create_session(
-                project_path=project_path,
-                code=code,
-                initial_commands=[],
-                timeout=timeout,
-            )
-            return CreateSessionResult(
-                success=True,
-                session_id=session.session_id,
-                execution_result=execution_result,
-            )
-        except Exception as e:
-            return CreateSessionResult(success=False, error=str(e), stack_trace=traceback.format_exc())
+        """)
 
-    @mcp.tool(
-        description=remove_tabs(
-            """
+_EXECUTE_COMMANDS_DESCRIPTION = remove_tabs(
+    """
             Execute CDP commands in a debugging session.
             Example payload:
             {"commands": [{"method": "Debugger.evaluateOnCallFrame", "params": {"expression": "1+1", "callFrameId": "6229198816740614410.1.0"}}, {"method": "Debugger.resume", "params": {}}]}
@@ -130,6 +114,9 @@ def make_mcp_server(name: str, project_path: str) -> FastMCP:
             For resume/step commands that trigger "Debugger.resumed", the session waits until the next
             pause ("Debugger.paused") or termination ("Inspector.detached") and includes those events in the result.
 
+            Optional 'event_filter': a list of event methods to return (e.g. ["Debugger.paused", "Inspector.detached"]).
+            Other events are dropped from the result; command results are always returned.
+
             Note: In ESM, with pause-on-exceptions set to 'uncaught', a top-level throw pauses once
             at the throw site with reason='exception'. The secondary pause for the module promise rejection
             (reason='promiseRejection') does not occur. If you switch policy to 'all', you may observe two pauses
@@ -257,11 +244,46 @@ def make_mcp_server(name: str, project_path: str) -> FastMCP:
             }
             ```
             """
-        ),
+)
+
+
+def make_mcp_server(name: str, project_path: str) -> FastMCP:
+    package_name = get_package_name(project_path)
+    mcp = FastMCP(name=name, instructions=_INSTRUCTIONS)
+    debugger = JSTSDebugger()
+
+    @mcp.tool(
+        description=_CREATE_SESSION_DESCRIPTION_TEMPLATE.format(package_name=package_name),
+    )
+    async def create_session(
+        code: str,
+        timeout: int = 30,
+    ) -> CreateSessionResult:
+        """
+        새로운 디버깅 세션을 생성하고 초기 이벤트 목록을 반환합니다.
+        """
+        try:
+            session, execution_result = await debugger.create_session(
+                project_path=project_path,
+                code=code,
+                initial_commands=[],
+                timeout=timeout,
+            )
+            return CreateSessionResult(
+                success=True,
+                session_id=session.session_id,
+                execution_result=execution_result,
+            )
+        except Exception as e:
+            return CreateSessionResult(success=False, error=str(e), stack_trace=_stack_trace())
+
+    @mcp.tool(
+        description=_EXECUTE_COMMANDS_DESCRIPTION,
     )
     async def execute_commands(
         session_id: str,
         commands: List[DebuggerCommand],
+        event_filter: Optional[List[str]] = None,
     ) -> ExecuteCommandsResult:
         """
         기존 디버깅 세션에서 명령어들을 실행하고 결과를 반환합니다.
@@ -271,13 +293,13 @@ def make_mcp_server(name: str, project_path: str) -> FastMCP:
             return ExecuteCommandsResult(success=False, error=f"Session {session_id} not found")
 
         try:
-            execution_result = await session.execute_commands(commands)
+            execution_result = await session.execute_commands(commands, event_filter=event_filter)
             return ExecuteCommandsResult(
                 success=True,
-                execution_result=[CDPItem.model_validate(item) for item in execution_result],
+                execution_result=[CDPItem.from_session_item(item) for item in execution_result],
             )
         except Exception as e:
-            return ExecuteCommandsResult(success=False, error=str(e), stack_trace=traceback.format_exc())
+            return ExecuteCommandsResult(success=False, error=str(e), stack_trace=_stack_trace())
 
     @mcp.tool(
         description="Close a debugging session.",
@@ -288,6 +310,6 @@ def make_mcp_server(name: str, project_path: str) -> FastMCP:
             await debugger.close_session(session_id)
             return CloseSessionResult(success=True, status=f"Session {session_id} closed.")
         except Exception as e:
-            return CloseSessionResult(success=False, error=str(e), stack_trace=traceback.format_exc())
+            return CloseSessionResult(success=False, error=str(e), stack_trace=_stack_trace())
 
     return mcp
@@ -8,21 +8,77 @@ managing a single, isolated debugging session.
 
 import asyncio
 import json
-from datetime import datetime
+import logging
+import sys
+import orjson
 from docker.models.containers import Container
-from typing import Any, Optional, Dict, List
+from typing import Any, Iterable, Optional, Dict, List, Tuple, Union
 from websockets.asyncio.client import ClientConnection
 from websockets.exceptions import ConnectionClosed
 from websockets.protocol import State
 from docker.errors import NotFound, APIError
 from jsts_debugger.config import AllowedDebuggerCommand, allowed_debugger_commands_set, entrypoint_ts_path, DebuggerCommand
-from jsts_debugger.lib.utils.command import is_command_to_ignore, is_debugger_resumed_command, is_program_run_command, is_command_may_run
+from jsts_debugger.lib.utils.command import CommandKind, classify_command
+
+log = logging.getLogger(__name__)
+
+_SCRIPT_PARSED_PREFIX = '{"method":"Debugger.scriptParsed"'
+
+# Plain ints, matching classify_command; IntFlag operators are too slow for the reader loop.
+_IGNORE_KIND = int(CommandKind.IGNORE)
+_TERMINAL_KINDS = int(CommandKind.PAUSED | CommandKind.FINISHED)
+_RUNNING_KINDS = int(CommandKind.RUN | CommandKind.MAY_RUN)
+
+
+def _message_text(message: Union[str, bytes]) -> str:
+    """Returns a received WebSocket message as text."""
+    return message if isinstance(message, str) else message.decode()
+
+
+def _truncate(text: str, limit: int = 2000) -> str:
+    """Shortens long CDP messages for logging, keeping the head and the tail."""
+    if len(text) <= limit:
+        return text
+    half = limit // 2
+    return f"{text[:half]}\n...\n{text[-half:]}"
+
+
+def _replace_surrogates(value: Any) -> Any:
+    """Replaces lone surrogates in decoded JSON with U+FFFD so the data can be re-encoded as UTF-8."""
+    if isinstance(value, str):
+        return value.encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+    if isinstance(value, dict):
+        return {key: _replace_surrogates(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_replace_surrogates(item) for item in value]
+    return value
+
+
+# Domain-enable commands sent by initialize(), serialized once per process.
+# Each entry holds the command without its opening brace so the id can be spliced in.
+_INIT_PAYLOADS: List[Tuple[str, bytes]] = [
+    (method, orjson.dumps({"method": method, "params": {}})[1:])
+    for method in (
+        "Runtime.enable",
+        "Debugger.enable",
+        "HeapProfiler.enable",
+        "Profiler.enable",
+        "Network.enable",
+    )
+]
+
 
 class CDPError(Exception):
     """Custom exception for CDP errors."""
     pass
 
 
+def _expire_response(fut: asyncio.Future, method: str):
+    """Timer callback that fails a response future still pending after the timeout."""
+    if not fut.done():
+        fut.set_exception(CDPError(f"Timeout waiting for response to command: {method}"))
+
+
 class JSTSSession:
     """
     Represents and manages a single, isolated debugging session.
@@ -60,35 +116,99 @@ class JSTSSession:
         self.ws = ws
         self.timeout_seconds = timeout
         self._message_id = 0
-        self._responses: Dict[int, Any] = {}
-        self._events: asyncio.Queue = asyncio.Queue()
+        self._responses: Dict[int, asyncio.Future] = {}
+        self._events: List[Optional[Dict[str, Any]]] = []
+        self._events_ready = asyncio.Event()
         self._reader_task = asyncio.create_task(self._reader())
         self._done = False
-        print(f"[{datetime.now()}] Session {self.session_id} created.")
+        log.info("Session %s created.", self.session_id)
 
     async def _reader(self):
         """Reads messages from the WebSocket and dispatches them."""
+        debug_enabled = log.isEnabledFor(logging.DEBUG)
         try:
             async for message in self.ws:
-                data = json.loads(message)
+                # V8 serializes the method first, so the most frequent ignored event
+                # can be dropped before paying for JSON parsing.
+                if isinstance(message, str) and message.startswith(_SCRIPT_PARSED_PREFIX):
+                    continue
+                try:
+                    data = orjson.loads(message)
+                except orjson.JSONDecodeError:
+                    # orjson rejects lone surrogates, which V8 emits for broken JS strings.
+                    data = _replace_surrogates(json.loads(message))
                 if "id" in data:
-                    if len(str(data)) > 2000:
-                        print(f"[{datetime.now()}] Received response: {str(data)[:1000]}\n...\n{str(data)[-1000:]}")
-                    else:
-                        print(f"[{datetime.now()}] Received response: {data}")
-                    self._responses[data["id"]] = data
+                    if debug_enabled:
+                        log.debug("Received response: %s", _truncate(_message_text(message)))
+                    fut = self._responses.pop(data["id"], None)
+                    if fut and not fut.done():
+                        if "error" in data:
+                            fut.set_exception(CDPError(data["error"]["message"]))
+                        else:
+                            fut.set_result(data.get("result"))
                 else:
-                    if is_command_to_ignore(data.get("method")):
+                    method = data.get("method")
+                    if method is not None:
+                        # Interned names compare by identity against the known-command tables.
+                        data["method"] = method = sys.intern(method)
+                    if classify_command(method) & _IGNORE_KIND:
                         continue
-                    if len(str(data)) > 200:
-                        print(f"[{datetime.now()}] Received event: {str(data)[:1000]}\n...\n{str(data)[-1000:]}")
-                    else:
-                        print(f"[{datetime.now()}] Received event: {data}")
-                    await self._events.put(data)
+                    if debug_enabled:
+                        log.debug("Received event: %s", _truncate(_message_text(message)))
+                    self._push_event(data)
         except ConnectionClosed:
-            print(f"[{datetime.now()}] Connection closed")
-            await self._events.put(None)
+            log.info("Connection closed")
+            self._push_event(None)
             self._done = True
+            for fut in self._responses.values():
+                if not fut.done():
+                    fut.set_exception(CDPError("Connection closed"))
+            self._responses.clear()
+
+    def _allocate_command(self) -> Tuple[int, asyncio.Future]:
+        """Allocates an id and a response future for a CDP command."""
+        self._message_id += 1
+        command_id = self._message_id
+        fut = asyncio.get_running_loop().create_future()
+        self._responses[command_id] = fut
+        return command_id, fut
+
+    def _register_command(
+        self, method: str, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, asyncio.Future, bytes]:
+        """
+        Allocates an id and a response future for a CDP command.
+        The command is serialized first, so a failure leaves no pending future behind.
+        Returns (command_id, future, serialized_command).
+        """
+        tail = orjson.dumps({"method": method, "params": params or {}})[1:]
+        return self._register_prebuilt_command(method, tail)
+
+    def _register_prebuilt_command(self, method: str, tail: bytes) -> Tuple[int, asyncio.Future, bytes]:
+        """
+        Like _register_command, but splices the id into a command serialized ahead of time.
+        `tail` is the serialized command without its opening brace.
+        """
+        command_id, fut = self._allocate_command()
+        log.debug("Sending command: %s", method)
+        return command_id, fut, b'{"id":%d,' % command_id + tail
+
+    async def _wait_for_response(self, command_id: int, fut: asyncio.Future, method: str) -> Any:
+        """
+        Waits for the response future of a registered command.
+        A single timer fails the future on timeout; no timer is armed when the timeout is not positive.
+        """
+        handle = None
+        if self.timeout_seconds > 0:
+            handle = asyncio.get_running_loop().call_later(
+                self.timeout_seconds, _expire_response, fut, method
+            )
+        try:
+            return await fut
+        finally:
+            if handle is not None:
+                handle.cancel()
+            self._responses.pop(command_id, None)
 
     async def _send_command(
         self, method: str, params: Optional[Dict[str, Any]] = None
@@ -102,24 +222,31 @@ class JSTSSession:
         """
         if self.is_done():
             raise CDPError("Session is already done")
-        
-        self._message_id += 1
-        command_id = self._message_id
-        command = {"id": command_id, "method": method, "params": params or {}}
-        print(f"[{datetime.now()}] Sending command: {command}")
-        await self.ws.send(json.dumps(command))
 
+        command_id, fut, payload = self._register_command(method, params)
         try:
-            async with asyncio.timeout(self.timeout_seconds):
-                while command_id not in self._responses:
-                    await asyncio.sleep(0.01)  # Yield control
-
-            response = self._responses.pop(command_id)
-            if "error" in response:
-                raise CDPError(response["error"]["message"])
-            return response.get("result")
-        except asyncio.TimeoutError:
-            raise CDPError(f"Timeout waiting for response to command: {method}")
+            await self.ws.send(payload, text=True)
+        except BaseException:
+            self._responses.pop(command_id, None)
+            raise
+        return await self._wait_for_response(command_id, fut, method)
+
+    async def _send_pipelined(
+        self, methods: List[str], registered: List[Tuple[int, asyncio.Future, bytes]]
+    ) -> List[Any]:
+        """Sends registered commands back-to-back and gathers their responses in order."""
+        try:
+            for _, _, payload in registered:
+                await self.ws.send(payload, text=True)
+        except BaseException:
+            for command_id, _, _ in registered:
+                self._responses.pop(command_id, None)
+            raise
+
+        return await asyncio.gather(*(
+            self._wait_for_response(command_id, fut, method)
+            for (command_id, fut, _), method in zip(registered, methods)
+        ))
 
     async def initialize(self) -> List[Dict[str, Any]]:
         """Initializes the session.
@@ -129,17 +256,35 @@ class JSTSSession:
         waits for pause/detach should be driven by higher-level operations (e.g.,
         after resume/step), not by calling initialize again.
         """
-        await self.execute_command("Runtime.enable", {})
-        await self.execute_command("Debugger.enable", {})
-        await self.execute_command("HeapProfiler.enable", {})
-        await self.execute_command("Profiler.enable", {})
-        await self.execute_command("Network.enable", {})
+        if self.is_done():
+            raise CDPError("Session is already done")
+
+        await self._send_pipelined(
+            [method for method, _ in _INIT_PAYLOADS],
+            [self._register_prebuilt_command(method, tail) for method, tail in _INIT_PAYLOADS],
+        )
 
         events = await self.execute_command("Runtime.runIfWaitingForDebugger", {})
         # events = await self._wait_for_pause_or_detach()
         return events
         # await self.execute_command("Debugger.pause", {})
 
+    def _push_event(self, event: Optional[Dict[str, Any]]):
+        """Appends an event to the buffer and wakes up a waiting consumer. None marks the end of the stream."""
+        self._events.append(event)
+        self._events_ready.set()
+
+    def _drain_ready(self) -> List[Optional[Dict[str, Any]]]:
+        """Returns all events that are already buffered, without waiting."""
+        buf, self._events = self._events, []
+        self._events_ready.clear()
+        return buf
+
+    async def _take_events(self) -> List[Optional[Dict[str, Any]]]:
+        """Waits until at least one event is buffered, then takes the whole buffer."""
+        await self._events_ready.wait()
+        return self._drain_ready()
+
     async def _wait_for_pause_or_detach(self, timeout: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Waits for a Debugger.paused or Inspector.detached event.
@@ -148,17 +293,29 @@ class JSTSSession:
         collected_results = []
         try:
             async with asyncio.timeout(timeout or self.timeout_seconds):
-                while not self.is_done():
-                    event = await self._events.get()
-                    if event is None:
-                        break
-                    collected_results.append({"type": "event", "data": event})
-                    if event.get("method") in ["Debugger.paused", "Inspector.detached", "Runtime.executionContextDestroyed"]:
+                # Keep consuming what the reader already buffered, even if it has finished.
+                while self._events or not self.is_done():
+                    batch = await self._take_events()
+                    terminated = False
+                    for index, event in enumerate(batch):
+                        if event is None:
+                            terminated = True
+                            break
+                        collected_results.append({"type": "event", "data": event})
+                        if classify_command(event.get("method")) & _TERMINAL_KINDS:
+                            # Leave the rest for the next command, in arrival order.
+                            leftovers = batch[index + 1:]
+                            if leftovers:
+                                self._events[:0] = leftovers
+                                self._events_ready.set()
+                            terminated = True
+                            break
+                    if terminated:
                         break
             return collected_results
         except asyncio.TimeoutError:
             # 에러 낼 시, 'may run'류 명령어들이 run되지 않은 경우 에러가 발생해 응답을 받지 못하게 됨.
-            print(f"Timeout waiting for pause/detach") # warning
+            log.warning("Timeout waiting for pause/detach")
             return collected_results
 
     async def execute_command(
@@ -184,8 +341,7 @@ class JSTSSession:
             raise CDPError(f"Session is already done while executing command: {method}")
 
         collected_results = []
-        while not self._events.empty() and not self.is_done():
-            event = await self._events.get()
+        for event in self._drain_ready():
             if event is None:
                 break
             collected_results.append({"type": "event", "data": event})
@@ -197,7 +353,7 @@ class JSTSSession:
         if command_result is not None:
             collected_results.append({"type": "command_result", "data": command_result})
 
-        if is_program_run_command(method) or is_command_may_run(method):
+        if classify_command(method) & _RUNNING_KINDS:
             # This command may cause execution to continue, so we wait for the next
             # pause or for the script to finish.
             run_events = await self._wait_for_pause_or_detach()
@@ -207,15 +363,31 @@ class JSTSSession:
 
     async def execute_commands(
         self, commands: list[DebuggerCommand],
-        allow_unknown_command: bool = False
+        allow_unknown_command: bool = False,
+        event_filter: Optional[Iterable[str]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Executes a list of commands and collects all subsequent events.
+        The whole batch is validated up front, so an unknown command is rejected before any command is sent.
+        If event_filter is given, only events whose method is in it are returned; command results are always kept.
+        Filtering happens after execution, so pause/termination detection still sees every event.
         """
+        if not allow_unknown_command:
+            unknown = [command.method for command in commands if command.method not in allowed_debugger_commands_set]
+            if unknown:
+                raise CDPError(f"Unknown commands: {unknown}")
+
         results = []
         for command in commands:
-            result = await self.execute_command(command.method, command.params, allow_unknown_command)
+            result = await self.execute_command(command.method, command.params, allow_unknown_command=True)
             results.extend(result)
+
+        if event_filter is not None:
+            wanted = frozenset(event_filter)
+            results = [
+                item for item in results
+                if item["type"] != "event" or item["data"].get("method") in wanted
+            ]
         return results
 
     # async def enable_debugger(
@@ -235,28 +407,32 @@ class JSTSSession:
         """
         self._reader_task.cancel()
         if self.ws and not (self.ws.state in [State.CLOSED, State.CLOSING]):
-            # print(f"[{datetime.now()}] Closing WebSocket")
+            log.debug("Closing WebSocket")
             try:
                 await self.ws.close()
             except Exception as e:
-                # print(f"[{datetime.now()}] Error while closing WebSocket for session {self.session_id}: {e}")
-                pass
+                log.debug("Error while closing WebSocket for session %s: %s", self.session_id, e)
+
+        await asyncio.to_thread(self.stop_container)
 
+    def stop_container(self):
+        """
+        Stops the session's container, blocking until Docker returns.
+        Usable without an event loop, e.g. from atexit handlers.
+        """
         try:
-            # print(f"[{datetime.now()}] Stopping container {self.container.short_id} for session {self.session_id}...")
+            log.debug("Stopping container %s for session %s...", self.container.short_id, self.session_id)
             self.container.stop(timeout=5)
         except NotFound:
-            # print(f"[{datetime.now()}] Warning: Container {self.container.short_id} was not found (already stopped).")
-            pass
+            log.debug("Container %s was not found (already stopped).", self.container.short_id)
         except APIError as e:
-            # print(f"[{datetime.now()}] Error while stopping container for session {self.session_id}: {e}")
-            pass
+            log.debug("Error while stopping container for session %s: %s", self.session_id, e)
 
     def set_timeout(self, seconds: int):
         """
         Sets the timeout for CDP operations in this session.
         """
-        # print(f"[{datetime.now()}] Setting timeout for session {self.session_id} to {seconds} seconds.")
+        log.debug("Setting timeout for session %s to %s seconds.", self.session_id, seconds)
         self.timeout_seconds = seconds
 
     # async def __aenter__(self):
@@ -1,8 +1,23 @@
 import pytest
+import pytest_asyncio
 import tempfile
 import json
 from pathlib import Path
+from fastmcp import Client
 from jsts_debugger.mcp import make_mcp_server
+from tests.jsts_debugger.e2e.helpers import (
+    create_session_with_code,
+    close_session,
+    get_paused_call_frame_id,
+    PausedSession,
+)
+
+# Harness for tests that only evaluate while paused. They all inspect the same `obj`
+# and never resume past the single `debugger;`.
+PAUSED_SESSION_CODE = """
+const obj = { a: 1, b: 2 };
+debugger;
+"""
 
 @pytest.fixture(scope="session")
 def test_project():
@@ -49,10 +64,35 @@ export async function main() {
         yield str(project_path)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def mcp_server(test_project):
     """
     Creates an MCP server instance for the test project.
-    This fixture is module-scoped, so the server is reused across tests in the same module.
+    This fixture is session-scoped, so one server (and its debugger backend) is shared by the whole suite.
+    Tests stay isolated because each one creates and closes its own debugging session.
     """
     return make_mcp_server("test-debugger", test_project)
+
+
+@pytest_asyncio.fixture
+async def mcp_client(mcp_server):
+    """
+    An MCP client connected to the shared server, kept open for the whole test
+    so helpers don't reconnect on every tool call.
+    """
+    async with Client(mcp_server) as client:
+        yield client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def paused_session(mcp_server):
+    """
+    One debugging session paused at PAUSED_SESSION_CODE's `debugger;`, shared by every
+    evaluation-only test. Tests using it must run in the session event loop
+    (@pytest.mark.asyncio(loop_scope="session")) and must not resume execution.
+    """
+    async with Client(mcp_server) as client:
+        session_id, initial_events = await create_session_with_code(client, PAUSED_SESSION_CODE)
+        call_frame_id = await get_paused_call_frame_id(initial_events)
+        yield PausedSession(client, session_id, call_frame_id)
+        await close_session(client, session_id)
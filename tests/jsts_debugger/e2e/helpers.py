@@ -1,7 +1,9 @@
-from typing import Any, Dict, List, Optional, Tuple, cast
-from fastmcp import FastMCP, Client
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, cast
+from fastmcp import Client
 import pytest
 from jsts_debugger.debugger import CDPItem
+from jsts_debugger.lib.utils.command import is_script_finished_command
 
 CODE_WITH_BREAKPOINT = """
 import { main } from 'test-project';
@@ -13,17 +15,28 @@ async function run() {
 run();
 """
 
+# A CDP command as (method, params).
+Command = Tuple[str, Mapping[str, Any]]
+
+# Minimal event_filter for tests that only check pausing and script completion.
+PAUSE_AND_FINISH_EVENTS: Tuple[str, ...] = (
+    "Debugger.paused",
+    "Inspector.detached",
+    "Runtime.executionContextDestroyed",
+)
+
+# Shared default for missing "data"/"params"; never mutated.
+_EMPTY: Dict[str, Any] = {}
+
 
 async def create_session_with_code(
-    mcp_server: FastMCP,
+    client: Client,
     code: str,
 ) -> Tuple[str, List[Dict[str, Any]]]:
     """Creates a session (execution starts immediately) and returns the session ID and initial events up to first pause or termination."""
-    client = Client(mcp_server)
-    async with client:
-        create_result = await client.call_tool(
-            "create_session", {"code": code}
-        )
+    create_result = await client.call_tool(
+        "create_session", {"code": code}
+    )
 
     sc = create_result.structured_content
     if sc is None:
@@ -40,14 +53,22 @@ async def create_session_with_code(
 
 
 async def execute_commands(
-    mcp_server: FastMCP, session_id: str, commands: List[Dict[str, Any]]
+    client: Client,
+    session_id: str,
+    commands: Sequence[Command],
+    event_filter: Optional[Sequence[str]] = None,
 ):
-    """Executes commands and returns the result dict (structured_data)."""
-    client = Client(mcp_server)
-    async with client:
-        execute_result = await client.call_tool(
-            "execute_commands", {"session_id": session_id, "commands": commands}
-        )
+    """
+    Executes (method, params) commands and returns the result dict (structured_data).
+    If event_filter is given, the server only returns events with those methods.
+    """
+    arguments: Dict[str, Any] = {
+        "session_id": session_id,
+        "commands": [{"method": method, "params": params} for method, params in commands],
+    }
+    if event_filter is not None:
+        arguments["event_filter"] = list(event_filter)
+    execute_result = await client.call_tool("execute_commands", arguments)
 
     sc = execute_result.structured_content
     if sc is None:
@@ -64,13 +85,11 @@ async def execute_commands(
     }
 
 
-async def close_session(mcp_server: FastMCP, session_id: str):
+async def close_session(client: Client, session_id: str):
     """Closes a session."""
-    client = Client(mcp_server)
-    async with client:
-        close_result = await client.call_tool(
-            "close_session", {"session_id": session_id}
-        )
+    close_result = await client.call_tool(
+        "close_session", {"session_id": session_id}
+    )
 
     sc = close_result.structured_content
     if sc is None:
@@ -84,13 +103,90 @@ async def close_session(mcp_server: FastMCP, session_id: str):
     assert data and data.get("status") == f"Session {session_id} closed."
 
 
+@dataclass(slots=True)
+class ClassifiedEvents:
+    """execution_result binned in one pass."""
+
+    paused: List[Dict[str, Any]] = field(default_factory=list)
+    finished: bool = False
+    command_results: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def classify_events(results: List[Dict[str, Any]]) -> ClassifiedEvents:
+    """Bins results into Debugger.paused events, script completion and command results in a single scan."""
+    classified = ClassifiedEvents()
+    for r in results:
+        kind = r.get("type")
+        data = r.get("data") or _EMPTY
+        if kind == "command_result":
+            classified.command_results.append(data)
+        elif kind == "event":
+            method = data.get("method")
+            if method == "Debugger.paused":
+                classified.paused.append(data)
+            elif method and is_script_finished_command(method):
+                classified.finished = True
+    return classified
+
+
+@dataclass(slots=True)
+class PausedSession:
+    """A session left paused at one call frame, shared by evaluation-only tests."""
+
+    client: Client
+    session_id: str
+    call_frame_id: str
+    # expression -> objectId; remote objects stay valid while the session stays paused
+    object_ids: Dict[str, str] = field(default_factory=dict)
+
+
+async def prepare_object_eval(paused: PausedSession, expression: str) -> str:
+    """
+    Evaluates expression on the paused call frame and returns the resulting objectId.
+    Results are memoized per session, so tests inspecting the same object share one evaluation.
+    """
+    object_id = paused.object_ids.get(expression)
+    if object_id is not None:
+        return object_id
+
+    eval_result = await execute_commands(
+        paused.client,
+        paused.session_id,
+        [("Debugger.evaluateOnCallFrame", {"expression": expression, "callFrameId": paused.call_frame_id})],
+    )
+    command_results = classify_events(eval_result.get("execution_result", [])).command_results
+    object_id = next(
+        (d["result"].get("objectId") for d in command_results if d.get("result", {}).get("type") == "object"),
+        None,
+    )
+    if object_id is None:
+        pytest.fail(f"Could not find the objectId for '{expression}'")
+    paused.object_ids[expression] = object_id
+    return object_id
+
+
+class PausedInfo(NamedTuple):
+    """Top call frame of the first Debugger.paused event."""
+
+    call_frame_id: str
+    script_id: Optional[str]
+
+
+async def get_paused_info(results: List[Dict[str, Any]]) -> PausedInfo:
+    """Finds the top call frame's ID and script ID of the first Debugger.paused event."""
+    top_frame = next(
+        (
+            event["params"]["callFrames"][0]
+            for event in classify_events(results).paused
+            if (event.get("params") or _EMPTY).get("callFrames")
+        ),
+        None,
+    )
+    if top_frame is None or top_frame.get("callFrameId") is None:
+        pytest.fail("Could not find a paused event with a call frame ID.")
+    return PausedInfo(top_frame["callFrameId"], top_frame.get("location", {}).get("scriptId"))
+
+
 async def get_paused_call_frame_id(results: List[Dict[str, Any]]) -> str:
     """Finds the call frame ID from a list of debugger events."""
-    for result in results:
-        if result.get("type") == "event":
-            event = result.get("data", {})
-            if event.get("method") == "Debugger.paused":
-                call_frames = event.get("params", {}).get("callFrames", [])
-                if call_frames:
-                    return call_frames[0].get("callFrameId")
-    pytest.fail("Could not find a paused event with a call frame ID.")
+    return (await get_paused_info(results)).call_frame_id
@@ -5,14 +5,15 @@ from tests.jsts_debugger.e2e.helpers import (
     execute_commands,
     close_session,
     get_paused_call_frame_id,
+    classify_events,
+    PAUSE_AND_FINISH_EVENTS,
 )
-from jsts_debugger.lib.utils.command import is_script_finished_command
 
 
 pytestmark = pytest.mark.asyncio
 
 
-async def test_set_skip_all_pauses(mcp_server):
+async def test_set_skip_all_pauses(mcp_client):
     code = """
 debugger;
 console.log('A');
@@ -20,34 +21,28 @@ debugger;
 console.log('B');
 """
 
-    session_id, _ = await create_session_with_code(mcp_server, code)
+    session_id, _ = await create_session_with_code(mcp_client, code)
 
     result = await execute_commands(
-        mcp_server,
+        mcp_client,
         session_id,
         [
-            {"method": "Debugger.setSkipAllPauses", "params": {"skip": True}},
-            {"method": "Debugger.resume", "params": {}},
+            ("Debugger.setSkipAllPauses", {"skip": True}),
+            ("Debugger.resume", {}),
         ],
+        event_filter=PAUSE_AND_FINISH_EVENTS,
     )
 
-    events = result.get("execution_result", [])
-    paused_found = any(
-        r.get("type") == "event" and r.get("data", {}).get("method") == "Debugger.paused"
-        for r in events
-    )
-    finished_found = any(
-        r.get("type") == "event"
-        and is_script_finished_command(r.get("data", {}).get("method", ""))
-        for r in events
-    )
+    events = classify_events(result.get("execution_result", []))
+    paused_found = bool(events.paused)
+    finished_found = events.finished
     assert not paused_found, "Should not pause when skipAllPauses is enabled"
     assert finished_found, "Script did not finish with skipAllPauses enabled"
 
-    await close_session(mcp_server, session_id)
+    await close_session(mcp_client, session_id)
 
 
-async def test_remove_breakpoint(mcp_server):
+async def test_remove_breakpoint(mcp_client):
     code = """
 debugger;
 console.log('line1');
@@ -55,75 +50,53 @@ console.log('line2');
 console.log('line3');
 """
 
-    session_id, _ = await create_session_with_code(mcp_server, code)
+    session_id, _ = await create_session_with_code(mcp_client, code)
 
     # Set a breakpoint at line 1 (0-indexed) then remove it
     bp_set = await execute_commands(
-        mcp_server,
+        mcp_client,
         session_id,
-        [{"method": "Debugger.setBreakpointByUrl", "params": {"lineNumber": 1, "url": "file:///app/entrypoint.ts"}}],
+        [("Debugger.setBreakpointByUrl", {"lineNumber": 1, "url": "file:///app/entrypoint.ts"})],
     )
 
-    breakpoint_id = None
-    for r in bp_set.get("execution_result", []):
-        if r.get("type") == "command_result" and "breakpointId" in r.get("data", {}):
-            breakpoint_id = r["data"]["breakpointId"]
-            break
+    command_results = classify_events(bp_set.get("execution_result", [])).command_results
+    breakpoint_id = next((d["breakpointId"] for d in command_results if "breakpointId" in d), None)
     assert breakpoint_id, "Failed to obtain breakpointId"
 
     # Remove and resume; should run to completion without pausing at that line
     result = await execute_commands(
-        mcp_server,
+        mcp_client,
         session_id,
         [
-            {"method": "Debugger.removeBreakpoint", "params": {"breakpointId": breakpoint_id}},
-            {"method": "Debugger.resume", "params": {}},
+            ("Debugger.removeBreakpoint", {"breakpointId": breakpoint_id}),
+            ("Debugger.resume", {}),
         ],
+        event_filter=PAUSE_AND_FINISH_EVENTS,
     )
 
-    events = result.get("execution_result", [])
-    paused_found = any(
-        r.get("type") == "event" and r.get("data", {}).get("method") == "Debugger.paused"
-        for r in events
-    )
-    finished_found = any(
-        r.get("type") == "event"
-        and is_script_finished_command(r.get("data", {}).get("method", ""))
-        for r in events
-    )
+    events = classify_events(result.get("execution_result", []))
+    paused_found = bool(events.paused)
+    finished_found = events.finished
     assert not paused_found, "Should not pause after removing the breakpoint"
     assert finished_found, "Script did not finish after removing the breakpoint and resuming"
 
-    await close_session(mcp_server, session_id)
-
-
-async def test_runtime_evaluate_global(mcp_server):
-    code = """
-debugger;
-"""
+    await close_session(mcp_client, session_id)
 
-    session_id, initial_events = await create_session_with_code(mcp_server, code)
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test_runtime_evaluate_global(paused_session):
     eval_result = await execute_commands(
-        mcp_server,
-        session_id,
-        [{"method": "Runtime.evaluate", "params": {"expression": "1 + 2", "returnByValue": True}}],
+        paused_session.client,
+        paused_session.session_id,
+        [("Runtime.evaluate", {"expression": "1 + 2", "returnByValue": True})],
     )
 
-    value_ok = False
-    for r in eval_result.get("execution_result", []):
-        if r.get("type") == "command_result":
-            if r.get("data", {}).get("result", {}).get("value") == 3:
-                value_ok = True
-                break
+    command_results = classify_events(eval_result.get("execution_result", [])).command_results
+    value_ok = any(d.get("result", {}).get("value") == 3 for d in command_results)
     assert value_ok, "Runtime.evaluate did not return expected value"
 
-    # Finish
-    await execute_commands(mcp_server, session_id, [{"method": "Debugger.resume", "params": {}}])
-    await close_session(mcp_server, session_id)
-
 
-async def test_precise_coverage_smoke(mcp_server):
+async def test_precise_coverage_smoke(mcp_client):
     code = """
 debugger;
 let x = 0;
@@ -131,39 +104,31 @@ x += 1;
 x += 2;
 """
 
-    session_id, initial_events = await create_session_with_code(mcp_server, code)
+    session_id, initial_events = await create_session_with_code(mcp_client, code)
 
     # Start coverage while paused at start, step a couple lines, take coverage, stop, then finish
-    # Step twice to execute increments while staying in paused cycles
+    # Step twice to execute increments while staying in paused cycles; the trailing resume runs to the end
     step_then_cov = await execute_commands(
-        mcp_server,
+        mcp_client,
         session_id,
         [
-            {"method": "Profiler.startPreciseCoverage", "params": {"callCount": True, "detailed": True}},
-            {"method": "Debugger.stepOver", "params": {}},
-            {"method": "Debugger.stepOver", "params": {}},
-            {"method": "Profiler.takePreciseCoverage", "params": {}},
-            {"method": "Profiler.stopPreciseCoverage", "params": {}},
+            ("Profiler.startPreciseCoverage", {"callCount": True, "detailed": True}),
+            ("Debugger.stepOver", {}),
+            ("Debugger.stepOver", {}),
+            ("Profiler.takePreciseCoverage", {}),
+            ("Profiler.stopPreciseCoverage", {}),
+            ("Debugger.resume", {}),
         ],
     )
 
-    got_coverage = False
-    for r in step_then_cov.get("execution_result", []):
-        if r.get("type") == "command_result" and isinstance(r.get("data"), dict):
-            if "result" in r.get("data", {}) or "coverage" in r.get("data", {}):
-                got_coverage = True
-                break
+    # One pass over the batch yields both the command results and the completion flag
+    events = classify_events(step_then_cov.get("execution_result", []))
+    got_coverage = any("result" in data or "coverage" in data for data in events.command_results)
     assert got_coverage, "Did not receive any precise coverage data/result"
 
-    # Now finish
-    finish = await execute_commands(mcp_server, session_id, [{"method": "Debugger.resume", "params": {}}])
-    finished_found = any(
-        r.get("type") == "event"
-        and is_script_finished_command(r.get("data", {}).get("method", ""))
-        for r in finish.get("execution_result", [])
-    )
+    finished_found = events.finished
     assert finished_found, "Script did not finish after resuming"
 
-    await close_session(mcp_server, session_id)
+    await close_session(mcp_client, session_id)
 
 
@@ -1,9 +1,8 @@
 import pytest
-import threading
-import time
-import asyncio
+import httpx
 from jsts_debugger import make_mcp_server
 from fastmcp import Client
+from fastmcp.client.transports import StreamableHttpTransport
 from jsts_debugger.lib.utils.command import is_script_finished_command
 
 pytestmark = pytest.mark.asyncio
@@ -13,23 +12,28 @@ async def test_readme_programmatic_usage_example(test_project):
     Tests the programmatic usage example from README.md.
     It verifies that the server can be started, a session created,
     commands executed, and the session closed, all from a Python script
-    interacting with the server over HTTP.
+    interacting with the server over streamable HTTP.
     """
     # --- Server Setup ---
-    # Use a different port to avoid conflicts with other tests
-    test_port = 8001 
+    # Serve the streamable-http app in-process through an ASGI transport,
+    # so no port, server thread or startup wait is needed
     mcp_server = make_mcp_server("jsts-debugger-readme-test", test_project)
-    
-    def run_server():
-        mcp_server.run(transport="streamable-http", host="127.0.0.1", port=test_port, path="/mcp")
-    
-    server_thread = threading.Thread(target=run_server, daemon=True)
-    server_thread.start()
-    time.sleep(2) # Give the server a moment to start
+    app = mcp_server.http_app(path="/mcp")
+
+    def asgi_client_factory(headers=None, timeout=None, auth=None):
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://testserver",
+            headers=headers,
+            timeout=timeout,
+            auth=auth,
+        )
 
     # --- Client Interaction ---
-    client = Client(f"http://127.0.0.1:{test_port}/mcp")
-    async with client:
+    client = Client(
+        StreamableHttpTransport("http://testserver/mcp", httpx_client_factory=asgi_client_factory)
+    )
+    async with app.router.lifespan_context(app), client:
         # 1. Create a debugging session
         code_to_debug = """
         console.log('Hello from the debugger!');
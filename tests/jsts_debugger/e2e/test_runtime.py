@@ -1,67 +1,81 @@
 import pytest
-from tests.jsts_debugger.e2e.helpers import (
-    create_session_with_code,
-    execute_commands,
-    close_session,
-    get_paused_call_frame_id,
-)
+from tests.jsts_debugger.e2e.helpers import classify_events, execute_commands, prepare_object_eval
 
-CODE_FOR_PROPERTIES = """
-const myObject = { a: 1, b: 'hello' };
-debugger;
-"""
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
-pytestmark = pytest.mark.asyncio
-
-async def test_get_properties(mcp_server):
+async def test_get_properties(paused_session):
     """
     Tests getting properties of an object.
     """
-    session_id, initial_events = await create_session_with_code(mcp_server, CODE_FOR_PROPERTIES)
+    # The shared session is paused at the `debugger;` after `obj` is defined.
+    object_id = await prepare_object_eval(paused_session, "obj")
 
-    # The code has a `debugger;` statement, so it should be paused.
-    # We can get the callFrameId directly from the initial events.
-    call_frame_id = await get_paused_call_frame_id(initial_events)  # type: ignore[arg-type]
+    # Now, get the properties of the object
+    properties_result = await execute_commands(
+        paused_session.client,
+        paused_session.session_id,
+        [("Runtime.getProperties", {"objectId": object_id})],
+    )
 
-    # First, evaluate 'myObject' to get its objectId
-    eval_result = await execute_commands(
-        mcp_server,
-        session_id,
-        [
-            {
-                "method": "Debugger.evaluateOnCallFrame",
-                "params": {"expression": "myObject", "callFrameId": call_frame_id},
-            }
-        ],
+    # Check the properties
+    command_results = classify_events(properties_result.get("execution_result", [])).command_results
+    properties_found = any(
+        {"a", "b"} <= {p["name"] for p in d.get("result", [])} for d in command_results
     )
 
-    object_id = None
-    for result in eval_result.get("execution_result", []):
-        if result.get("type") == "command_result":
-            result_data = result.get("data", {})
-            if result_data.get("result", {}).get("type") == "object":
-                object_id = result_data["result"].get("objectId")
-                break
-    
-    assert object_id, "Could not find the objectId for 'myObject'"
+    assert properties_found, "Did not find the expected properties for 'obj'"
 
-    # Now, get the properties of the object
-    properties_result = await execute_commands(
-        mcp_server, session_id, [{"method": "Runtime.getProperties", "params": {"objectId": object_id}}]
+
+async def test_object_keys_by_value(paused_session):
+    """
+    Tests reading an object's key set in a single round trip, without property descriptors.
+    """
+    keys_result = await execute_commands(
+        paused_session.client,
+        paused_session.session_id,
+        [
+            (
+                "Debugger.evaluateOnCallFrame",
+                {
+                    "expression": "Object.keys(obj)",
+                    "callFrameId": paused_session.call_frame_id,
+                    "returnByValue": True,
+                },
+            )
+        ],
     )
 
-    # Check the properties
-    properties_found = False
-    for result in properties_result.get("execution_result", []):
-        if result.get("type") == "command_result":
-            props_data = result.get("data", {}).get("result", [])
-            prop_names = {p["name"] for p in props_data}
-            if "a" in prop_names and "b" in prop_names:
-                properties_found = True
-                break
+    command_results = classify_events(keys_result.get("execution_result", [])).command_results
+    keys = next((d["result"].get("value") for d in command_results if "result" in d), None)
+    assert keys is not None and {"a", "b"} <= set(keys), f"Unexpected keys for 'obj': {keys}"
+
 
-    assert properties_found, "Did not find the expected properties for 'myObject'"
+async def test_evaluate_lone_surrogate(paused_session):
+    """
+    Tests that a response carrying a lone surrogate string is still delivered, with the surrogate replaced.
+    """
+    eval_result = await execute_commands(
+        paused_session.client,
+        paused_session.session_id,
+        [
+            (
+                "Debugger.evaluateOnCallFrame",
+                {
+                    "expression": "'\\ud800'.length",
+                    "callFrameId": paused_session.call_frame_id,
+                },
+            ),
+            (
+                "Debugger.evaluateOnCallFrame",
+                {
+                    "expression": "'\\ud800'",
+                    "callFrameId": paused_session.call_frame_id,
+                },
+            ),
+        ],
+    )
 
-    # Clean up
-    await execute_commands(mcp_server, session_id, [{"method": "Debugger.resume", "params": {}}])
-    await close_session(mcp_server, session_id)
+    command_results = classify_events(eval_result.get("execution_result", [])).command_results
+    assert len(command_results) == 2, f"Missing evaluation results: {eval_result}"
+    assert command_results[0]["result"].get("value") == 1
+    assert command_results[1]["result"].get("value") == "\ufffd"
@@ -4,8 +4,8 @@ from tests.jsts_debugger.e2e.helpers import (
     create_session_with_code,
     execute_commands,
     close_session,
+    classify_events,
 )
-from jsts_debugger.lib.utils.command import is_script_finished_command
 
 CODE_FOR_TIMEOUT_TEST = """
 debugger; // Pause to keep the session alive
@@ -15,43 +15,44 @@ console.log('Resuming after delay...');
 pytestmark = pytest.mark.asyncio
 
 
-async def test_session_persists_after_delay(mcp_server):
+@pytest.mark.parametrize(
+    "idle_seconds",
+    [
+        # Smoke check that a paused session survives a brief idle
+        pytest.param(1, id="short"),
+        # Full-length idle persistence check; deselected by default, run with `-m slow`
+        pytest.param(30, id="full", marks=pytest.mark.slow),
+    ],
+)
+async def test_session_persists_after_delay(mcp_client, idle_seconds):
     """
     Tests that a session remains active and responsive after a period of inactivity.
     """
     # 1. Create a session that pauses immediately
     session_id, initial_events = await create_session_with_code(
-        mcp_server, CODE_FOR_TIMEOUT_TEST
+        mcp_client, CODE_FOR_TIMEOUT_TEST
     )
     
     # initial_events are event lists; creation success is validated in helper
-    assert any(
-        event.get("data", {}).get("method") == "Debugger.paused"
-        for event in initial_events if event.get("type") == "event"
-    ), "Execution did not pause as expected."
+    assert classify_events(initial_events).paused, "Execution did not pause as expected."
 
-    # 2. Wait for 30 seconds to test session persistence
+    # 2. Stay idle to test session persistence
     # The debugger could potentially timeout and close inactive connections after a period,
     # so we wait to verify the session remains active and connected even after inactivity
-    await asyncio.sleep(30)
+    await asyncio.sleep(idle_seconds)
 
     # 3. Resume execution to see if the session is still alive
     resume_result = await execute_commands(
-        mcp_server, session_id, [{"method": "Debugger.resume", "params": {}}]
+        mcp_client, session_id, [("Debugger.resume", {})]
     )
     assert resume_result["success"], f"Resume command failed: {resume_result}"
 
 
     # 4. Verify that the script ran to completion
-    execution_result = resume_result.get("execution_result", [])
-    script_finished = any(
-        is_script_finished_command(event.get("data", {}).get("method", ""))
-        for event in execution_result
-        if event.get("type") == "event"
-    )
+    script_finished = classify_events(resume_result.get("execution_result", [])).finished
     assert (
         script_finished
     ), "Script did not finish after the delay, session might have timed out."
 
     # 5. Clean up
-    await close_session(mcp_server, session_id)
+    await close_session(mcp_client, session_id)
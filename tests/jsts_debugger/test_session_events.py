@@ -0,0 +1,117 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+import pytest
+from websockets.exceptions import ConnectionClosed
+from websockets.protocol import State
+from jsts_debugger.debugger import JSTSDebugger
+from jsts_debugger.session import JSTSSession
+
+
+class ScriptedWebSocket:
+    """
+    Stands in for the CDP WebSocket. Each command is answered with an empty result,
+    followed by the messages scripted for its method. None closes the connection.
+    """
+
+    def __init__(self, replies: Dict[str, List[Optional[Dict[str, Any]]]]):
+        self.replies = replies
+        self.state = State.OPEN
+        self._incoming: asyncio.Queue = asyncio.Queue()
+
+    async def send(self, payload, text: bool = False):
+        command = json.loads(payload)
+        self._incoming.put_nowait(json.dumps({"id": command["id"], "result": {}}))
+        for message in self.replies.get(command["method"], []):
+            self._incoming.put_nowait(None if message is None else json.dumps(message))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self._incoming.get()
+        if message is None:
+            self.state = State.CLOSED
+            raise ConnectionClosed(None, None)
+        return message
+
+    async def close(self):
+        self.state = State.CLOSED
+
+
+class StoppedContainer:
+    """Stands in for the session container, which these tests never start."""
+
+    short_id = "none"
+
+    def __init__(self):
+        self.stopped = False
+
+    def stop(self, timeout: int = 10):
+        self.stopped = True
+
+
+def _event(method: str) -> Dict[str, Any]:
+    return {"method": method, "params": {}}
+
+
+def _event_methods(results: List[Dict[str, Any]]) -> List[str]:
+    return [item["data"]["method"] for item in results if item["type"] == "event"]
+
+
+@pytest.mark.asyncio
+async def test_events_buffered_before_close_are_returned():
+    """
+    Tests that a pause read just before the connection closed is still returned.
+    """
+    ws = ScriptedWebSocket({
+        "Debugger.resume": [_event("Debugger.resumed"), _event("Debugger.paused"), None],
+    })
+    session = JSTSSession("test", StoppedContainer(), ws, timeout=1)  # type: ignore[arg-type]
+
+    results = await session.execute_command("Debugger.resume", {})
+
+    assert session.is_done()
+    assert _event_methods(results) == ["Debugger.resumed", "Debugger.paused"]
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_events_after_pause_are_kept_for_next_command():
+    """
+    Tests that events read after the pause are returned by the next command, in arrival order.
+    """
+    ws = ScriptedWebSocket({
+        "Debugger.resume": [
+            _event("Debugger.resumed"),
+            _event("Debugger.paused"),
+            _event("Runtime.consoleAPICalled"),
+            _event("Runtime.exceptionThrown"),
+        ],
+    })
+    session = JSTSSession("test", StoppedContainer(), ws, timeout=1)  # type: ignore[arg-type]
+
+    resume_results = await session.execute_command("Debugger.resume", {})
+    next_results = await session.execute_command("Runtime.evaluate", {"expression": "1"})
+
+    assert _event_methods(resume_results) == ["Debugger.resumed", "Debugger.paused"]
+    assert _event_methods(next_results) == ["Runtime.consoleAPICalled", "Runtime.exceptionThrown"]
+    await session.close()
+
+
+def test_close_all_sessions_without_loop_stops_containers():
+    """
+    Tests that closing all sessions outside an event loop, as atexit does, still stops their containers.
+    """
+    container = StoppedContainer()
+
+    async def open_session() -> JSTSSession:
+        return JSTSSession("test", container, ScriptedWebSocket({}))  # type: ignore[arg-type]
+
+    debugger = JSTSDebugger.__new__(JSTSDebugger)
+    debugger.sessions = {"test": asyncio.run(open_session())}
+
+    debugger.close_all_sessions()
+
+    assert container.stopped
+    assert not debugger.sessions